@@ -14,29 +14,29 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import functools
 import importlib.metadata
 import json
 import logging
-import platform
+import operator
 import subprocess
+import sys
+import time
+from array import array
+from collections import deque
 from datetime import datetime, timezone
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields, is_dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from typing import Any, Callable, Deque, Dict, Final, List, Optional, Tuple, Union
 
 try:
     from bleak import BleakClient, BleakError
     from bleak import BleakScanner
+    from bleak.backends.characteristic import BleakGATTCharacteristic
+    from bleak.backends.descriptor import BleakGATTDescriptor
     from bleak.backends.device import BLEDevice
-    # Try to get version from __version__ (pip installations)
-    try:
-        from bleak import __version__ as bleak_version
-    except ImportError:
-        # Fall back to importlib.metadata (apt installations)
-        try:
-            bleak_version = importlib.metadata.version("bleak")
-        except Exception:
-            bleak_version = "unknown"
+    from bleak.backends.scanner import AdvertisementData
+    from bleak.backends.service import BleakGATTService
 except ModuleNotFoundError as exc:  # pragma: no cover - depends on optional dep
     raise SystemExit(
         "The 'bleak' package is required to run this script. Install it via\n"
@@ -44,9 +44,102 @@ except ModuleNotFoundError as exc:  # pragma: no cover - depends on optional dep
         "and try again."
     ) from exc
 
-DEFAULT_SCAN_DURATION = 30.0
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - depends on optional dep
+    orjson = None  # JSON output falls back to the standard library encoder
+
+
+def _resolve_bleak_version() -> str:
+    # Try to get version from __version__ (pip installations)
+    try:
+        from bleak import __version__
+        return __version__
+    except ImportError:
+        # Fall back to importlib.metadata (apt installations)
+        try:
+            return importlib.metadata.version("bleak")
+        except Exception:
+            return "unknown"
+
+
+# Resolved once at import; importlib.metadata lookups scan site-packages.
+_BLEAK_VERSION: Final[str] = _resolve_bleak_version()
+_UTC: Final = timezone.utc
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SCAN_DURATION = 15.0
+DEFAULT_SCAN_MODE = "active"
+# Random private addresses typically rotate every 15 minutes.
+DEFAULT_CACHE_TTL = 900.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
 DEFAULT_SCAN_OUTPUT_PATH = Path("config/discovered_devices.json")
 DEFAULT_PROFILE_OUTPUT_PATH = Path("config/device_profile.json")
+JSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE if orjson else 0
+)
+# Advertisements are buffered by the scan callback and folded into the
+# per-device store in batches at this interval (seconds).
+ADVERTISEMENT_DRAIN_INTERVAL = 0.1
+ADVERTISEMENT_BUFFER_SIZE = 512
+
+# GATT objects expose ``handle`` on every supported bleak release; detect it
+# once rather than paying for getattr(obj, "handle", None) on every object.
+_HAS_HANDLE: Final[bool] = all(
+    hasattr(cls, "handle") for cls in (BleakGATTService, BleakGATTCharacteristic, BleakGATTDescriptor)
+)
+_get_handle: Callable[[Any], Optional[int]] = (
+    operator.attrgetter("handle") if _HAS_HANDLE else lambda obj: getattr(obj, "handle", None)
+)
+
+# BlueZ only scans passively through an advertisement monitor, which bleak
+# refuses to register without ``or_patterns``, and the monitor only reports
+# advertisements that match one of them. Match every value of the Flags AD
+# (type 0x01) so any advertiser carrying Flags is reported; advertisements
+# without a Flags field (e.g. many non-connectable beacons) are not.
+_PASSIVE_OR_PATTERNS: Final = [(0, 0x01, bytes([flags])) for flags in range(0x01, 0x20)]
+
+# A device together with one of its advertisements, as delivered by bleak.
+ScanEntry = Tuple[BLEDevice, AdvertisementData]
+
+# Profile records are immutable once built; slots are only available on 3.10+.
+_DATACLASS_OPTIONS: Dict[str, Any] = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _DATACLASS_OPTIONS["slots"] = True
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_hci() -> Dict[str, bool]:
+    """Run ``hciconfig`` once and map each adapter name to whether it is UP.
+
+    The result is cached so the adapter check and the adapter listing share a
+    single subprocess. An empty dict means hciconfig is unavailable or failed.
+    """
+    adapters: Dict[str, bool] = {}
+    try:
+        result = subprocess.run(
+            ["hciconfig"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return adapters
+    if result.returncode != 0:
+        return adapters
+
+    current = None
+    for line in result.stdout.splitlines():
+        if line.startswith("hci"):
+            # Adapter header, e.g. "hci0:   Type: Primary  Bus: UART"
+            current = line.split()[0].rstrip(":")
+            adapters[current] = False
+        elif current is not None:
+            flags = line.split()
+            if "UP" in flags or "RUNNING" in flags:
+                adapters[current] = True
+    return adapters
 
 
 def check_bluetooth_adapter(adapter: Optional[str] = None) -> Tuple[bool, Optional[str]]:
@@ -56,34 +149,24 @@ def check_bluetooth_adapter(adapter: Optional[str] = None) -> Tuple[bool, Option
         Tuple of (is_available, error_message)
     """
     # On Linux/Raspberry Pi, check using hciconfig or bluetoothctl
-    if platform.system() != "Linux":
+    if sys.platform != "linux":
         return True, None  # Skip checks on non-Linux systems
     
     adapter_name = adapter or "hci0"
     
     # Try hciconfig first (if available)
-    try:
-        result = subprocess.run(
-            ["hciconfig", adapter_name],
-            capture_output=True,
-            text=True,
-            timeout=5,
+    adapters = _probe_hci()
+    if adapter_name in adapters:
+        if adapters[adapter_name]:
+            return True, None
+        log.warning(f"Bluetooth adapter {adapter_name} is DOWN.")
+        return False, (
+            f"Bluetooth adapter {adapter_name} is DOWN.\n"
+            f"Power it on with: sudo hciconfig {adapter_name} up\n"
+            f"Or use bluetoothctl: sudo bluetoothctl power on"
         )
-        if result.returncode == 0:
-            output = result.stdout
-            if "UP" in output or "RUNNING" in output:
-                return True, None
-            elif "DOWN" in output:
-                logging.warning(f"Bluetooth adapter {adapter_name} is DOWN.")
-                return False, (
-                    f"Bluetooth adapter {adapter_name} is DOWN.\n"
-                    f"Power it on with: sudo hciconfig {adapter_name} up\n"
-                    f"Or use bluetoothctl: sudo bluetoothctl power on"
-                )
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass  # hciconfig not available, try bluetoothctl
     
-    # Fall back to bluetoothctl
+    # hciconfig not available (or adapter unknown to it), fall back to bluetoothctl
     try:
         result = subprocess.run(
             ["bluetoothctl", "show", adapter_name],
@@ -96,7 +179,7 @@ def check_bluetooth_adapter(adapter: Optional[str] = None) -> Tuple[bool, Option
             if "Powered: yes" in output:
                 return True, None
             else:
-                logging.warning(f"Bluetooth adapter {adapter_name} is not powered.")
+                log.warning(f"Bluetooth adapter {adapter_name} is not powered.")
                 return False, (
                     f"Bluetooth adapter {adapter_name} is not powered.\n"
                     f"Power it on with: bluetoothctl power on\n"
@@ -106,36 +189,106 @@ def check_bluetooth_adapter(adapter: Optional[str] = None) -> Tuple[bool, Option
         pass
     
     # If we can't check, assume it might work but warn
-    logging.warning(
+    log.warning(
         "Could not verify Bluetooth adapter status (hciconfig/bluetoothctl not available). "
         "Proceeding anyway, but if you get errors, check that Bluetooth is enabled."
     )
     return True, None
 
 
+async def _probe_adapters_dbus() -> Optional[Dict[str, bool]]:
+    """Ask BlueZ over D-Bus which adapters exist and whether they are powered.
+
+    Returns ``None`` when no D-Bus client library is importable or BlueZ cannot
+    be reached, in which case callers fall back to the command-line probes.
+    """
+    try:
+        # dbus-fast ships with current bleak releases; older ones use dbus-next.
+        from dbus_fast import BusType, Message, MessageType
+        from dbus_fast.aio import MessageBus
+    except ImportError:
+        try:
+            from dbus_next import BusType, Message, MessageType
+            from dbus_next.aio import MessageBus
+        except ImportError:
+            return None
+
+    try:
+        bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+    except Exception as exc:
+        log.debug("Unable to connect to the system D-Bus: %s", exc)
+        return None
+    try:
+        reply = await bus.call(
+            Message(
+                destination="org.bluez",
+                path="/",
+                interface="org.freedesktop.DBus.ObjectManager",
+                member="GetManagedObjects",
+            )
+        )
+    except Exception as exc:
+        log.debug("Unable to query BlueZ over D-Bus: %s", exc)
+        return None
+    finally:
+        bus.disconnect()
+
+    if reply.message_type != MessageType.METHOD_RETURN:
+        log.debug("BlueZ D-Bus query failed: %s", reply.body)
+        return None
+
+    return {
+        path.rsplit("/", 1)[-1]: bool(interfaces["org.bluez.Adapter1"]["Powered"].value)
+        for path, interfaces in reply.body[0].items()
+        if "org.bluez.Adapter1" in interfaces
+    }
+
+
+async def _check_adapter(adapter: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+    """Check the adapter via D-Bus, falling back to check_bluetooth_adapter()."""
+    adapters = await _probe_adapters_dbus()
+    if adapters is None:
+        # The command-line probes block on subprocesses; keep them off the loop.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, check_bluetooth_adapter, adapter)
+
+    if adapter is None:
+        # Without --adapter bleak uses BlueZ's default adapter, i.e. the first
+        # powered one, so any powered adapter will do.
+        if any(adapters.values()):
+            return True, None
+        found = ", ".join(sorted(adapters)) or "none"
+        log.warning("No powered Bluetooth adapter is known to BlueZ.")
+        return False, (
+            f"No powered Bluetooth adapter is known to BlueZ (found: {found}).\n"
+            f"Power one on with: bluetoothctl power on\n"
+            f"Or: sudo hciconfig hci0 up"
+        )
+
+    if adapter not in adapters:
+        found = ", ".join(sorted(adapters)) or "none"
+        log.warning(f"Bluetooth adapter {adapter} is not known to BlueZ.")
+        return False, (
+            f"Bluetooth adapter {adapter} is not known to BlueZ (found: {found}).\n"
+            f"Pick another adapter with --adapter, or check: bluetoothctl list"
+        )
+    if not adapters[adapter]:
+        log.warning(f"Bluetooth adapter {adapter} is not powered.")
+        return False, (
+            f"Bluetooth adapter {adapter} is not powered.\n"
+            f"Power it on with: bluetoothctl power on\n"
+            f"Or: sudo hciconfig {adapter} up"
+        )
+    return True, None
+
+
 def get_available_adapters() -> List[str]:
     """List available Bluetooth adapters."""
-    adapters = []
+    if sys.platform != "linux":
+        return []
     
-    if platform.system() != "Linux":
-        return adapters
-    
-    # Try to get adapters from hciconfig
-    try:
-        result = subprocess.run(
-            ["hciconfig"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            # Parse hciX from output
-            for line in result.stdout.splitlines():
-                if line.strip().startswith("hci"):
-                    adapter = line.split()[0].rstrip(":")
-                    adapters.append(adapter)
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
+    # Try to get adapters from hciconfig (shares the cached probe)
+    adapters = list(_probe_hci())
     
     # Fall back to bluetoothctl
     if not adapters:
@@ -160,20 +313,20 @@ def get_available_adapters() -> List[str]:
             pass
     
     # Default to hci0 if nothing found but on Linux
-    if not adapters and platform.system() == "Linux":
+    if not adapters and sys.platform == "linux":
         adapters = ["hci0"]
     
     return adapters
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DescriptorProfile:
     uuid: str
     handle: Optional[int] = None
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CharacteristicProfile:
     uuid: str
     handle: Optional[int] = None
@@ -182,7 +335,7 @@ class CharacteristicProfile:
     descriptors: List[DescriptorProfile] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ServiceProfile:
     uuid: str
     handle: Optional[int] = None
@@ -190,126 +343,377 @@ class ServiceProfile:
     characteristics: List[CharacteristicProfile] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DeviceInfo:
     name: Optional[str]
     address: Optional[str]
     rssi: Optional[int]
-    manufacturer_data: Dict[str, Any] = field(default_factory=dict)
+    # Raw advertisement payloads keyed by company ID; hex-encoded only on write.
+    manufacturer_data: Dict[int, bytes] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
-    bleak_version: str = bleak_version
+    bleak_version: str = _BLEAK_VERSION
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DeviceProfile:
     device: DeviceInfo
     services: List[ServiceProfile] = field(default_factory=list)
 
 
-def _format_key(key: Any) -> str:
-    if isinstance(key, int):
-        return hex(key)
-    return str(key)
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
 
+def _dataclass_encoder(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    names = _field_names(cls)
+    return lambda value: {name: getattr(value, name) for name in names}
 
-def _to_jsonable(value: Any) -> Any:
-    """Recursively convert a value into a JSON-serialisable structure."""
-    if isinstance(value, (bytes, bytearray, memoryview)):
+
+# Exact-type dispatch for _default(); one dict lookup instead of an
+# isinstance() chain for every value the encoder hands back to Python. The
+# profile dataclasses are registered up front with their field names resolved.
+_DEFAULT_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    bytes: bytes.hex,
+    bytearray: bytearray.hex,
+    memoryview: memoryview.hex,
+    set: list,
+    frozenset: list,
+    **{
+        cls: _dataclass_encoder(cls)
+        for cls in (DescriptorProfile, CharacteristicProfile, ServiceProfile, DeviceInfo, DeviceProfile)
+    },
+}
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+_SET_TYPES = (set, frozenset)
+
+
+def _default(value: Any) -> Any:
+    """Encode the values the JSON encoders do not handle natively.
+
+    Advertisement payloads arrive as raw bytes and are emitted as hex strings;
+    set-like containers (e.g. service UUID collections) become lists. The
+    standard library encoder also hands back dataclasses, which are expanded
+    one level at a time so no full asdict() copy of the tree is built.
+    """
+    encoder = _DEFAULT_ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    # Subclasses of the types above are rare; check them the slow way.
+    if isinstance(value, _BYTES_TYPES):
+        # .hex() reads the buffer in place, including non-contiguous views.
         return value.hex()
-    if isinstance(value, Mapping):
-        return {_format_key(k): _to_jsonable(v) for k, v in value.items()}
-    if isinstance(value, Iterable) and not isinstance(value, (str, bytes, bytearray)):
-        return [_to_jsonable(v) for v in value]
-    return value
+    if isinstance(value, _SET_TYPES):
+        return list(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return {name: getattr(value, name) for name in _field_names(type(value))}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
-def _extract_device_info(device: BLEDevice) -> DeviceInfo:
-    metadata = getattr(device, "metadata", {}) or {}
-    return DeviceInfo(
-        name=device.name,
-        address=device.address,
-        rssi=device.rssi,
-        manufacturer_data=_to_jsonable(metadata.get("manufacturer_data", {})),
-        metadata=_to_jsonable(metadata),
-    )
+# Fallback encoder, configured once: json.dumps() builds a fresh JSONEncoder on
+# every call that passes non-default options.
+_JSON_ENCODER = json.JSONEncoder(default=_default, indent=2, ensure_ascii=False)
 
 
-async def build_profile(device: BLEDevice) -> DeviceProfile:
-    """Build the device profile for the provided BLE device."""
-    logging.info("Connecting to device %s (%s)", device.name, device.address)
-    try:
-        async with BleakClient(device) as client:
-            logging.info("Connected. Enumerating services...")
-            services = await client.get_services()
-            profile = DeviceProfile(
-                device=_extract_device_info(device)
-            )
+def _write_json(output_path: Path, payload: Any) -> None:
+    """Write ``payload`` as indented UTF-8 JSON with a trailing newline.
+
+    Either encoder makes a single pass over the tree: dataclasses, raw
+    advertisement bytes and sets are converted in _default() as they are
+    reached, with no separate conversion walk beforehand.
+    """
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(payload, default=_default, option=JSON_OPTIONS))
+        return
+    # The stdlib encoder can stream: write its chunks through the file buffer
+    # rather than joining the whole document into one string first. Newlines
+    # stay "\n" on every platform so the output matches orjson's byte for byte.
+    with output_path.open("w", encoding="utf-8", newline="\n") as fh:
+        fh.writelines(_JSON_ENCODER.iterencode(payload))
+        fh.write("\n")
+
+
+class ScanResults:
+    """Discovered devices stored column-wise, one row per address.
+
+    Rows keep first-seen order and a repeated advertisement overwrites its
+    device's row, so each column holds exactly one value per device.
+    """
+
+    def __init__(self) -> None:
+        self.devices: List[BLEDevice] = []
+        self.addresses: List[str] = []
+        self.names: List[Optional[str]] = []
+        self.rssis = array("h")
+        self.manufacturer_data: List[Dict[int, bytes]] = []
+        self.service_uuids: List[List[str]] = []
+        self._rows: Dict[str, int] = {}
+        # Seconds the scanner actually ran; shorter than requested when the
+        # scan stopped early on a target match.
+        self.duration = 0.0
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def add(self, device: BLEDevice, advertisement: AdvertisementData) -> int:
+        """Record an advertisement and return the row it was stored in."""
+        row = self._rows.get(device.address)
+        if row is None:
+            row = self._rows[device.address] = len(self.addresses)
+            self.devices.append(device)
+            self.addresses.append(device.address)
+            self.names.append(device.name)
+            self.rssis.append(advertisement.rssi)
+            self.manufacturer_data.append(advertisement.manufacturer_data)
+            self.service_uuids.append(advertisement.service_uuids)
+        else:
+            self.devices[row] = device
+            self.names[row] = device.name
+            self.rssis[row] = advertisement.rssi
+            self.manufacturer_data[row] = advertisement.manufacturer_data
+            self.service_uuids[row] = advertisement.service_uuids
+        return row
+
+    def find(self, target_name: Optional[str], target_address: Optional[str]) -> Optional[int]:
+        """Return the row matching ``target_address`` (preferred) or ``target_name``.
+
+        Both comparisons are case-insensitive. Each lookup index is built in a
+        single pass over its column; the first device seen wins a name clash.
+        """
+        if target_address:
+            row = self._rows.get(target_address)
+            if row is None:
+                by_address = {address.lower(): row for row, address in enumerate(self.addresses)}
+                row = by_address.get(target_address.lower())
+            if row is not None:
+                return row
+        if target_name:
+            by_name: Dict[str, int] = {}
+            for row, name in enumerate(self.names):
+                if name:
+                    by_name.setdefault(name.lower(), row)
+            return by_name.get(target_name.lower())
+        return None
+
+    def device_info(self, row: int) -> DeviceInfo:
+        """Return a DeviceInfo view of a single row."""
+        return DeviceInfo(
+            name=self.names[row],
+            address=self.addresses[row],
+            rssi=self.rssis[row],
+            manufacturer_data=self.manufacturer_data[row],
+            metadata={
+                "uuids": self.service_uuids[row],
+                "manufacturer_data": self.manufacturer_data[row],
+            },
+        )
+
 
-            for service in services:
-                service_profile = ServiceProfile(
+async def build_profile(
+    device: Union[BLEDevice, str],
+    device_info: DeviceInfo,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    adapter: Optional[str] = None,
+) -> DeviceProfile:
+    """Build the device profile for the provided BLE device (or address)."""
+    try:
+        return await _read_profile(device, device_info, connect_timeout, adapter)
+    except BleakError as exc:
+        raise SystemExit(f"Failed to communicate with the device: {exc}") from exc
+    except asyncio.TimeoutError as exc:
+        # bleak signals a connect timeout with a bare asyncio.TimeoutError.
+        raise SystemExit(
+            f"Failed to communicate with the device: timed out after {connect_timeout:g} s"
+        ) from exc
+
+
+async def _read_profile(
+    device: Union[BLEDevice, str],
+    device_info: DeviceInfo,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    adapter: Optional[str] = None,
+) -> DeviceProfile:
+    """Connect and enumerate the GATT tree; BleakError propagates to the caller."""
+    log.info("Connecting to device %s (%s)", device_info.name, device_info.address)
+    # BlueZ and CoreBluetooth reuse their cached GATT database on reconnect;
+    # WinRT needs to be asked to. Service Changed indications still invalidate it.
+    # A BLEDevice carries the adapter it was seen on; a bare address is
+    # otherwise resolved through BlueZ's default adapter.
+    client_kwargs = {"adapter": adapter} if adapter else {}
+    client = BleakClient(
+        device, timeout=connect_timeout, winrt={"use_cached_services": True}, **client_kwargs
+    )
+    async with client:
+        log.info("Connected. Enumerating services...")
+        # Recent bleak releases resolve services while connecting; only
+        # older ones need the explicit (and deprecated) discovery call.
+        services = getattr(client, "services", None) or await client.get_services()
+        profile = DeviceProfile(
+            device=device_info,
+            services=[
+                ServiceProfile(
                     uuid=service.uuid,
-                    handle=getattr(service, "handle", None),
+                    handle=_get_handle(service),
                     description=service.description,
-                )
-                for characteristic in service.characteristics:
-                    char_profile = CharacteristicProfile(
-                        uuid=characteristic.uuid,
-                        handle=getattr(characteristic, "handle", None),
-                        description=characteristic.description,
-                        properties=sorted(list(characteristic.properties)),
-                    )
-                    for descriptor in characteristic.descriptors:
-                        descriptor_profile = DescriptorProfile(
-                            uuid=descriptor.uuid,
-                            handle=getattr(descriptor, "handle", None),
-                            description=descriptor.description,
+                    characteristics=[
+                        CharacteristicProfile(
+                            uuid=characteristic.uuid,
+                            handle=_get_handle(characteristic),
+                            description=characteristic.description,
+                            properties=sorted(characteristic.properties, key=str.lower),
+                            descriptors=[
+                                DescriptorProfile(
+                                    uuid=descriptor.uuid,
+                                    handle=_get_handle(descriptor),
+                                    description=descriptor.description,
+                                )
+                                for descriptor in characteristic.descriptors
+                            ],
                         )
-                        char_profile.descriptors.append(descriptor_profile)
-                    service_profile.characteristics.append(char_profile)
-                profile.services.append(service_profile)
-    except BleakError as exc:
-        raise SystemExit(f"Failed to communicate with the device: {exc}") from exc
-
+                        for characteristic in service.characteristics
+                    ],
+                )
+                for service in services
+            ],
+        )
     return profile
 
 
 def write_profile(profile: DeviceProfile, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as fh:
-        json.dump(asdict(profile), fh, indent=2)
-    logging.info("Device profile written to %s", output_path)
+    # Both encoders walk the dataclasses directly; no asdict() copy is made.
+    _write_json(output_path, profile)
+    log.info("Device profile written to %s", output_path)
 
 
-async def scan_devices(duration: float, adapter: Optional[str] = None) -> Sequence[BLEDevice]:
-    """Scan for BLE devices with optional adapter specification."""
-    logging.info("Scanning for BLE devices for %.1f seconds...", duration)
-    
-    # Check adapter availability before scanning (Linux only)
-    if platform.system() == "Linux":
-        available, error_msg = check_bluetooth_adapter(adapter)
-        if not available and error_msg:
-            raise SystemExit(
-                f"Bluetooth adapter not available: {error_msg}\n\n"
-                "For Raspberry Pi Zero W 2, ensure:\n"
-                "  1. Bluetooth service is running: sudo systemctl start bluetooth\n"
-                "  2. Adapter is powered on: sudo hciconfig hci0 up\n"
-                "  3. User is in bluetooth group: sudo usermod -aG bluetooth $USER\n"
-                "  4. pi-bluetooth package is installed: sudo apt install pi-bluetooth"
-            )
+def _prepare_output_dirs(*output_paths: Path) -> None:
+    """Create the output directories ahead of the writes, best effort.
+
+    Failures are only logged: the writers create their directory again and
+    report the error when that file is written, so one bad output path cannot
+    cost the other output.
+    """
+    for parent in {path.parent for path in output_paths}:
+        try:
+            parent.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            log.debug("Could not create %s yet: %s", parent, exc)
+
+
+def _raise_if_adapter_unavailable(available: bool, error_msg: Optional[str]) -> None:
+    if not available and error_msg:
+        raise SystemExit(
+            f"Bluetooth adapter not available: {error_msg}\n\n"
+            "For Raspberry Pi Zero W 2, ensure:\n"
+            "  1. Bluetooth service is running: sudo systemctl start bluetooth\n"
+            "  2. Adapter is powered on: sudo hciconfig hci0 up\n"
+            "  3. User is in bluetooth group: sudo usermod -aG bluetooth $USER\n"
+            "  4. pi-bluetooth package is installed: sudo apt install pi-bluetooth"
+        )
+
+
+async def scan_devices(
+    duration: float,
+    adapter: Optional[str] = None,
+    target_name: Optional[str] = None,
+    target_address: Optional[str] = None,
+    scanning_mode: str = DEFAULT_SCAN_MODE,
+) -> Tuple[ScanResults, Optional[int]]:
+    """Scan for BLE devices with optional adapter specification.
+
+    Advertisements are consumed as they arrive. When a target name or address
+    is given, the scan stops as soon as that device is heard instead of
+    waiting out the full duration, and the row of the matching device is
+    returned alongside every device seen so far.
+    """
+    log.info("Scanning for BLE devices for %.1f seconds...", duration)
     
+    target_name_lc = target_name.lower() if target_name else None
+    target_address_lc = target_address.lower() if target_address else None
+    # Resolved with the row of the first advertisement matching the target.
+    matched: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+    # Devices re-advertise many times per scan; the results keep only the
+    # latest packet per address so each device is reported once.
+    results = ScanResults()
+    pending: Deque[ScanEntry] = deque(maxlen=ADVERTISEMENT_BUFFER_SIZE)
+
+    def on_advertisement(device: BLEDevice, advertisement: AdvertisementData) -> None:
+        # Keep the callback to a single append; bursts are processed in drain().
+        pending.append((device, advertisement))
+
+    def drain() -> None:
+        batch = list(pending)
+        pending.clear()
+        for device, advertisement in batch:
+            row = results.add(device, advertisement)
+            if matched.done():
+                continue
+            # The address takes precedence over the name, mirroring ScanResults.find().
+            if target_address_lc:
+                if device.address.lower() == target_address_lc:
+                    matched.set_result(row)
+            elif target_name_lc and device.name and device.name.lower() == target_name_lc:
+                matched.set_result(row)
+
+    async def drain_periodically() -> None:
+        while True:
+            await asyncio.sleep(ADVERTISEMENT_DRAIN_INTERVAL)
+            drain()
+
+    if scanning_mode == "passive" and sys.platform == "darwin":
+        raise SystemExit("Passive scanning is not supported on macOS; use --scan-mode active.")
+
     # Create scanner with optional adapter
     # On Linux/BlueZ, adapter can be specified when creating BleakScanner
+    scanner_kwargs = {"adapter": adapter} if adapter else {}
+    bluez_args: Dict[str, Any] = {"filters": {"Transport": "le", "DuplicateData": False}}
+    if scanning_mode == "passive":
+        bluez_args["or_patterns"] = _PASSIVE_OR_PATTERNS
     try:
-        if adapter:
-            # Create scanner with specific adapter
-            scanner = BleakScanner(adapter=adapter)
-            devices = await scanner.discover(timeout=duration)
-        else:
-            # Use default adapter discovery
-            devices = await BleakScanner.discover(timeout=duration)
+        # Active scanning requests scan responses, which carry the full local
+        # name, so a name match succeeds on the first advertising interval.
+        # On BlueZ, restrict discovery to LE; duplicate reports are dropped
+        # since ScanResults keeps a single row per address anyway.
+        scanner = BleakScanner(
+            detection_callback=on_advertisement,
+            scanning_mode=scanning_mode,
+            bluez=bluez_args,
+            **scanner_kwargs,
+        )
+        # Check adapter availability (Linux only) while the scanner starts up
+        # rather than before it; a failed check stops the scanner again.
+        probe = asyncio.ensure_future(_check_adapter(adapter)) if sys.platform == "linux" else None
+        try:
+            await scanner.start()
+        except BleakError:
+            if probe is not None:
+                _raise_if_adapter_unavailable(*await probe)
+            raise
+        except BaseException:
+            # Don't leave the probe pending behind e.g. a missing bus socket.
+            if probe is not None:
+                probe.cancel()
+            raise
+        if probe is not None:
+            available, error_msg = await probe
+            if not available and error_msg:
+                await scanner.stop()
+                _raise_if_adapter_unavailable(available, error_msg)
+        drainer = asyncio.ensure_future(drain_periodically())
+        started = time.monotonic()
+        try:
+            # Returns early once the target is heard; otherwise (or with no
+            # target requested) scans for the full duration.
+            await asyncio.wait({matched}, timeout=duration)
+        finally:
+            drainer.cancel()
+            await scanner.stop()
+            results.duration = time.monotonic() - started
+            drain()
     except BleakError as exc:
         if "No powered Bluetooth adapters found" in str(exc):
-            available_adapters = get_available_adapters()
+            loop = asyncio.get_running_loop()
+            available_adapters = await loop.run_in_executor(None, get_available_adapters)
             error_msg = (
                 f"Bluetooth adapter not detected: {exc}\n\n"
                 "Troubleshooting steps:\n"
@@ -334,37 +738,91 @@ async def scan_devices(duration: float, adapter: Optional[str] = None) -> Sequen
             raise SystemExit(error_msg) from exc
         raise
     
-    logging.info("Discovered %d devices", len(devices))
-    for device in devices:
-        logging.debug(
-            "Found device: name=%s address=%s rssi=%s",
-            device.name,
-            device.address,
-            device.rssi,
-        )
-    return devices
+    log.info("Discovered %d devices", len(results))
+    # Skip the per-device loop entirely unless -vv asked for it.
+    if log.isEnabledFor(logging.DEBUG):
+        for name, address, rssi in zip(results.names, results.addresses, results.rssis):
+            log.debug("Found device: name=%s address=%s rssi=%s", name, address, rssi)
+    return results, matched.result() if matched.done() else None
 
 
-def write_scan_results(devices: Sequence[BLEDevice], output_path: Path, duration: float) -> None:
+def write_scan_results(results: ScanResults, output_path: Path) -> None:
     payload = {
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "scan_duration_seconds": duration,
-        "device_count": len(devices),
-        "devices": [asdict(_extract_device_info(device)) for device in devices],
+        "generated_at": datetime.now(_UTC).isoformat(),
+        "scan_duration_seconds": round(results.duration, 2),
+        "device_count": len(results),
+        # Assemble the records straight from the columns (same shape as
+        # DeviceInfo) instead of materialising a view object per device.
+        "devices": [
+            {
+                "name": name,
+                "address": address,
+                "rssi": rssi,
+                "manufacturer_data": manufacturer_data,
+                "metadata": {"uuids": uuids, "manufacturer_data": manufacturer_data},
+                "bleak_version": _BLEAK_VERSION,
+            }
+            for name, address, rssi, manufacturer_data, uuids in zip(
+                results.names,
+                results.addresses,
+                results.rssis,
+                results.manufacturer_data,
+                results.service_uuids,
+            )
+        ],
     }
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, indent=2)
-    logging.info("Discovery results written to %s", output_path)
+    _write_json(output_path, payload)
+    log.info("Discovery results written to %s", output_path)
+
 
+def load_cached_device(
+    scan_output: Path, target_name: Optional[str], target_address: Optional[str], max_age: float
+) -> Optional[DeviceInfo]:
+    """Return the target's record from a recent discovery output, if any.
+
+    The file must be younger than ``max_age`` seconds. Matching follows
+    ScanResults.find(): the address takes precedence over the name and both
+    comparisons are case-insensitive.
+    """
+    try:
+        age = time.time() - scan_output.stat().st_mtime
+    except OSError:
+        return None
+    if age > max_age:
+        log.info("Ignoring discovery cache %s (%.0f seconds old)", scan_output, age)
+        return None
+
+    def matches(record: Dict[str, Any]) -> bool:
+        if target_address:
+            return (record.get("address") or "").lower() == target_address.lower()
+        return (record.get("name") or "").lower() == (target_name or "").lower()
 
-def select_device(devices: Sequence[BLEDevice], target_name: Optional[str], target_address: Optional[str]) -> Optional[BLEDevice]:
-    for device in devices:
-        if target_address and device.address and device.address.lower() == target_address.lower():
-            return device
-        if target_name and device.name and device.name.lower() == target_name.lower():
-            return device
-    return None
+    try:
+        records = json.loads(scan_output.read_bytes())["devices"]
+        record = next((record for record in records if matches(record)), None)
+        if record is None or not record.get("address"):
+            return None
+        # Undo the JSON encoding: keys were stringified and payloads hex-encoded.
+        # Files from older versions (e.g. "0xffff" keys) fail here and are skipped.
+        manufacturer_data = {
+            int(key): bytes.fromhex(value)
+            for key, value in (record.get("manufacturer_data") or {}).items()
+        }
+        uuids = (record.get("metadata") or {}).get("uuids", [])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+        log.warning("Ignoring unreadable discovery cache %s: %s", scan_output, exc)
+        return None
+    return DeviceInfo(
+        name=record.get("name"),
+        address=record["address"],
+        rssi=record.get("rssi"),
+        manufacturer_data=manufacturer_data,
+        metadata={
+            "uuids": uuids,
+            "manufacturer_data": manufacturer_data,
+        },
+    )
 
 
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
@@ -403,6 +861,36 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         "--adapter",
         help="Bluetooth adapter to use (e.g., 'hci0' for Raspberry Pi). Auto-detected if not specified.",
     )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help="Seconds to wait for the connection when profiling a device (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help=(
+            "Connect straight to the target's address from a recent --scan-output file "
+            "instead of scanning; rescans if the file is stale or the connection fails."
+        ),
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help="Maximum age in seconds of the discovery output used by --use-cache (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--scan-mode",
+        choices=("active", "passive"),
+        default=DEFAULT_SCAN_MODE,
+        help=(
+            "BLE scanning mode (default: %(default)s). Active scanning finds devices faster; "
+            "passive scanning on Linux only reports advertisements that carry a Flags "
+            "field, and is not available on macOS."
+        ),
+    )
     return parser.parse_args(argv)
 
 
@@ -418,28 +906,85 @@ def configure_logging(verbosity: int) -> None:
 
 
 async def async_main(args: argparse.Namespace) -> None:
-    devices = await scan_devices(args.scan_duration, adapter=args.adapter)
-    write_scan_results(devices, args.scan_output, args.scan_duration)
+    loop = asyncio.get_running_loop()
+    output_paths = [args.scan_output]
+    if args.device_name or args.mac_address:
+        output_paths.append(args.profile_output)
+    # Create the output directories while the radio work runs; the writers
+    # below then only find them in place. The preparation never raises, so it
+    # is safe to leave unawaited when the run ends early. Writes (and the JSON
+    # encoding they do) also run in the executor so the event loop is never
+    # blocked on I/O.
+    outputs_ready = loop.run_in_executor(None, _prepare_output_dirs, *output_paths)
+
+    if args.use_cache and (args.device_name or args.mac_address):
+        cached = load_cached_device(args.scan_output, args.device_name, args.mac_address, args.cache_ttl)
+        if cached is not None:
+            log.info("Using cached address %s from %s", cached.address, args.scan_output)
+            try:
+                profile = await _read_profile(
+                    cached.address, cached, args.connect_timeout, args.adapter
+                )
+            except (BleakError, asyncio.TimeoutError) as exc:
+                # bleak reports a connect timeout as a bare asyncio.TimeoutError.
+                reason = str(exc) or f"timed out after {args.connect_timeout:g} s"
+                log.warning("Cached address %s failed (%s); rescanning.", cached.address, reason)
+            else:
+                await outputs_ready
+                await loop.run_in_executor(None, write_profile, profile, args.profile_output)
+                return
+
+    results, match = await scan_devices(
+        args.scan_duration,
+        adapter=args.adapter,
+        target_name=args.device_name,
+        target_address=args.mac_address,
+        scanning_mode=args.scan_mode,
+    )
+    await outputs_ready
+    await loop.run_in_executor(None, write_scan_results, results, args.scan_output)
 
     if not args.device_name and not args.mac_address:
-        logging.info("No target specified; skipping device profiling.")
+        log.info("No target specified; skipping device profiling.")
         return
 
-    target_device = select_device(devices, args.device_name, args.mac_address)
-    if not target_device:
+    if match is None:
+        # Fall back to the full device list if the callback recorded no match.
+        match = results.find(args.device_name, args.mac_address)
+    if match is None:
         identifier = args.mac_address or args.device_name
         raise SystemExit(
             "No device matching %s was found. Review %s to pick a candidate."
             % (identifier, args.scan_output)
         )
 
-    profile = await build_profile(target_device)
-    write_profile(profile, args.profile_output)
+    # Connect using the BLEDevice captured by the (already stopped) discovery
+    # scanner; bleak only starts a scanner of its own when given a bare address.
+    profile = await build_profile(
+        results.devices[match],
+        results.device_info(match),
+        connect_timeout=args.connect_timeout,
+        adapter=args.adapter,
+    )
+    await loop.run_in_executor(None, write_profile, profile, args.profile_output)
+
+
+def install_uvloop() -> None:
+    """Use uvloop's faster event loop when it is installed (POSIX only)."""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+    log.debug("Using uvloop %s event loop", uvloop.__version__)
 
 
 def main(argv: Optional[List[str]] = None) -> None:
     args = parse_args(argv)
     configure_logging(args.verbose)
+    install_uvloop()
 
     try:
         asyncio.run(async_main(args))